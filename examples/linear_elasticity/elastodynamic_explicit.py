@@ -0,0 +1,67 @@
+r"""
+The linear elastodynamics solution of an iron plate impact problem solved by
+the explicit central difference method.
+
+Find :math:`\ul{u}` such that:
+
+.. math::
+    \int_{\Omega} \rho \ul{v} \pddiff{\ul{u}}{\ul{v}}
+    + \int_{\Omega} D_{ijkl}\ e_{ij}(\ul{v}) e_{kl}(\ul{u})
+    = 0
+    \;, \quad \forall \ul{v} \;,
+
+where
+
+.. math::
+    D_{ijkl} = \mu (\delta_{ik} \delta_{jl}+\delta_{il} \delta_{jk}) +
+    \lambda \ \delta_{ij} \delta_{kl}
+    \;.
+
+Notes
+-----
+
+The problem definition is taken from
+:ref:`linear_elasticity-elastodynamic`, only the mass matrix is lumped by the
+``dw_volume_dot_lumped`` term, as required by the explicit
+``ts.central_difference`` solver. Each time step then requires only
+a residual evaluation. The time step is reduced to the critical time step
+estimated from the element sizes and the longitudinal wave speed.
+
+Usage Examples
+--------------
+
+Run with the default settings (results stored in ``output/ed_explicit/``)::
+
+  python simple.py examples/linear_elasticity/elastodynamic_explicit.py
+
+The HRZ lumping of the mass matrix can be used by setting `mass` to
+``'dw_volume_dot_lumped_hrz'``.
+"""
+from __future__ import absolute_import
+from examples.linear_elasticity.elastodynamic import *
+
+mass = 'dw_volume_dot_lumped'
+
+equations = {
+    'balance_of_forces' :
+    """%s.i.Omega(solid.rho, ddv, ddu)
+     + dw_zero.i.Omega(dv, du)
+     + dw_lin_elastic.i.Omega(solid.D, v, u) = 0""" % mass,
+}
+
+solvers['tscd'] = ('ts.central_difference', {
+    't0' : 0.0,
+    't1' : t1,
+    'dt' : dt,
+    'n_step' : None,
+
+    'wave_speed' : cl,
+    'courant' : 0.5,
+
+    'verbose' : 1,
+})
+
+options.update({
+    'ts' : 'tscd',
+    'output_dir' : 'output/ed_explicit',
+})
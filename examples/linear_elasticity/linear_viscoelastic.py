@@ -9,10 +9,13 @@ total time interval, and released afterwards.
 
 This example uses exponential fading memory kernel
 :math:`\Hcal_{ijkl}(t) = \Hcal_{ijkl}(0) e^{-d t}` with decay
-:math:`d`. Two equation kinds are supported - 'th' and 'eth'. In 'th'
-mode the tabulated kernel is linearly interpolated to required times
-using :func:`interp_conv_mat()`. In 'eth' mode, the computation is exact
-for exponential kernels.
+:math:`d`. Three equation kinds are supported - 'th', 'th_exp' and 'eth'. In
+'th' mode the tabulated kernel is linearly interpolated to required times
+using :func:`interp_conv_mat()`. In 'th_exp' mode, the same terms are used
+with the kernel given by :class:`ExpKernel
+<sfepy.terms.terms_th.ExpKernel>`, and the history convolution is updated
+recursively. In 'eth' mode, the computation is exact for exponential kernels
+as well.
 
 Find :math:`\ul{u}` such that:
 
@@ -81,6 +84,7 @@ sys.path.append('.')
 from sfepy.base.base import output
 from sfepy.mechanics.matcoefs import stiffness_from_lame
 from sfepy.homogenization.utils import interp_conv_mat
+from sfepy.terms.terms_th import ExpKernel
 from sfepy import data_dir
 import six
 
@@ -104,6 +108,7 @@ def get_th_pars(ts, coors, mode=None, times=None, kernel=None, **kwargs):
 
     if mode == 'special':
         out['H'] = interp_conv_mat(kernel, ts, times)
+        out['He'] = ExpKernel(kernel[:1], [decay])
 
     elif mode == 'qp':
         out['H0'] = kernel[0]
@@ -163,6 +168,14 @@ def post_process(out, pb, state, extend=False):
         out['viscous_stress'] = Struct(name='output_data', mode='cell',
                                        data=vstress, dofs=None)
 
+    elif mode == 'th_exp':
+        # The recursively updated history requires 'preserve_caches=True' as
+        # in the 'eth' mode below.
+        vstress = ev('ev_cauchy_stress_th.2.Omega(ts, th.He, du/dt)',
+                     ts=ts, mode='el_avg', preserve_caches=True)
+        out['viscous_stress'] = Struct(name='output_data', mode='cell',
+                                       data=vstress, dofs=None)
+
     else:
         # The eth terms require 'preserve_caches=True' in order to have correct
         # fading memory history.
@@ -229,6 +242,15 @@ if mode == 'th':
          = - dw_surface_ltr.2.Right( load.val, v )""",
     }
 
+elif mode == 'th_exp':
+    # General form with the recursively updated exponential kernel.
+    equations = {
+        'elasticity' :
+        """dw_lin_elastic.2.Omega( solid.D, v, u )
+         + dw_lin_elastic_th.2.Omega( ts, th.He, v, du/dt )
+         = - dw_surface_ltr.2.Right( load.val, v )""",
+    }
+
 else:
     # Fast form that is exact for exponential kernels.
     equations = {